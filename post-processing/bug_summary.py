@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 
-from collections import defaultdict, OrderedDict
+from collections import OrderedDict
 from pathlib import Path
 
 import numpy as np
@@ -54,9 +54,17 @@ def main():
     # bugs triggered. Convert the data to long format (via `melt`)
     triggered_cols = ['triggered_%d' % trial for trial in range(0, 10)]
     id_vars = ['target', 'program', 'bug', 'fuzzer']
+    # Explicit dtypes skip the type-inference pass: the string keys come out
+    # as categoricals (so every groupby below hashes small integer codes
+    # instead of re-hashing strings, and `melt` keeps the dtype) and the
+    # trigger times as float32, which only need to order and carry NaNs
     df = pd.read_csv(
         DATA_PATH,
-        usecols=id_vars + triggered_cols
+        usecols=id_vars + triggered_cols,
+        dtype={
+            **{col: 'category' for col in id_vars},
+            **{col: 'float32' for col in triggered_cols},
+        }
     ).melt(
         id_vars=id_vars,
         value_vars=triggered_cols,
@@ -67,36 +75,32 @@ def main():
         columns=dict(value='seconds')
     )
     # Rename fuzzers for the paper
-    df['fuzzer'] = df.fuzzer.map(FUZZERS)
+    df['fuzzer'] = df.fuzzer.map(FUZZERS).astype('category')
+
+    # Keep only the trials that actually triggered a bug. Most summaries below
+    # work on this subset
+    triggered_df = df.dropna(subset=['seconds'])
 
     #
     # Target counts
     #
 
-    bug_data = defaultdict(dict)
-
-    # Count the number of bugs triggered across all trials.
-
-    for (program, fuzzer), bugs_df in df.groupby(by=['program', 'fuzzer']):
-        count = bugs_df.seconds.dropna().count()
-        bug_data[program][fuzzer] = count
-
-    # Initialize an `OrderedDict` (so the targets appear in the order that we
-    # want) for transforming into a `DataFrame`
-    results = OrderedDict(Target=[])
-    for fuzzer in FUZZERS.values():
-        results[fuzzer] = []
-
-    # Build the `OrderedDict`
-    for target in TARGETS:
-        results['Target'].append(target)
-        for fuzzer in FUZZERS.values():
-            if fuzzer not in bug_data[target]:
-                results[fuzzer].append(np.nan)
-            else:
-                results[fuzzer].append(bug_data[target][fuzzer])
-
-    count_df = pd.DataFrame.from_dict(results)
+    # Count the number of bugs triggered across all trials. A single groupby
+    # does the counting; the reindex lays out the table in the order that we
+    # want (missing program/fuzzer combinations become NaN)
+    count_df = df.groupby(
+        ['program', 'fuzzer'],
+        observed=True,
+        sort=False
+    )['seconds'].count().unstack(
+        'fuzzer'
+    ).reindex(
+        index=TARGETS,
+        columns=list(FUZZERS.values())
+    ).rename_axis(
+        index='Target',
+        columns=None
+    ).reset_index()
 
     style = count_df.style
     style.format(na_rep='\\xmark')
@@ -107,28 +111,31 @@ def main():
     # Total
     #
 
-    totals = df.groupby(['program', 'bug']).apply(
-        lambda x: x[~x.seconds.isna()].fuzzer
+    # Every triggering trial counts once, so this is a flat value_counts over
+    # the triggered subset (computed once, not per fuzzer)
+    totals = triggered_df['fuzzer'].value_counts().reindex(
+        list(FUZZERS.values()), fill_value=0
     )
 
     print('Totals:')
     for fuzzer in FUZZERS.values():
-        print(f'{fuzzer}: {totals.value_counts()[fuzzer]}')
+        print(f'{fuzzer}: {totals[fuzzer]}')
     print('')
 
     #
     # Best
     #
 
-    best_fuzzers = defaultdict(int)
+    # A fuzzer is (equal) best on a target if it triggered the row maximum.
+    # The boolean mask gives both the per-target winners and, summed, the
+    # per-fuzzer totals (all-NaN rows have no winners)
+    best_mask = count_df.set_index('Target')
+    best_mask = best_mask.eq(best_mask.max(axis=1), axis=0)
+    best_fuzzers = best_mask.sum()
 
     print('Best (per target):')
-    for target, target_df in count_df.groupby('Target'):
-        max_bugs = target_df.max(axis=1, numeric_only=True).values[0]
-        best = target_df.loc[:, (target_df == max_bugs).all()]
-        for fuzzer in best:
-            best_fuzzers[fuzzer] += 1
-        print(f'  {target}: {", ".join(best)}')
+    for target, row in best_mask.sort_index().iterrows():
+        print(f'  {target}: {", ".join(row.index[row])}')
     print('')
 
     print('Best:')
@@ -140,10 +147,22 @@ def main():
     # Unique
     #
 
-    unique = defaultdict(int)
-    for (program, fuzzer), fuzz_df in df.groupby(['program', 'fuzzer']):
-        bugs = fuzz_df[~fuzz_df.seconds.isna()].bug.unique()
-        unique[fuzzer] += len(bugs)
+    # A bug is unique to a fuzzer if it is triggered in _any_ trial, so
+    # collapse the trials before counting
+    unique_trig = triggered_df.drop_duplicates(['program', 'bug', 'fuzzer'])
+
+    # Index the triggered (program, bug, fuzzer) triples into a bug x fuzzer
+    # boolean matrix: the unique and missed counts are then plain NumPy
+    # column reductions over the matrix
+    fuzzer_names = list(FUZZERS.values())
+    bug_ids, bug_index = pd.factorize(
+        pd.MultiIndex.from_frame(unique_trig[['program', 'bug']]))
+    fuzzer_ids = pd.Categorical(unique_trig['fuzzer'],
+                                categories=fuzzer_names).codes
+    trig_matrix = np.zeros((len(bug_index), len(fuzzer_names)), dtype=bool)
+    trig_matrix[bug_ids, fuzzer_ids] = True
+
+    unique = pd.Series(trig_matrix.sum(axis=0), index=fuzzer_names)
 
     print('Unique:')
     for fuzzer in FUZZERS.values():
@@ -154,39 +173,36 @@ def main():
     # Fastest
     #
 
-    fastest = df[~df.seconds.isna()].groupby(['program', 'bug']).apply(
-        lambda x: pd.Series(x[x.seconds == x.seconds.min()].fuzzer.unique())
-    )
+    # The fastest fuzzers for a bug are those that triggered it at the
+    # minimum time over all trials (there may be ties). A grouped transform
+    # broadcasts each bug's minimum back over the rows, replacing the
+    # per-group Python apply
+    min_seconds = triggered_df.groupby(
+        ['program', 'bug'], observed=True, sort=False
+    )['seconds'].transform('min')
+    fastest = triggered_df[
+        triggered_df.seconds == min_seconds
+    ].drop_duplicates(
+        ['program', 'bug', 'fuzzer']
+    )['fuzzer'].value_counts().reindex(list(FUZZERS.values()), fill_value=0)
 
     print('Fastest:')
     for fuzzer in FUZZERS.values():
-        print(f'{fuzzer}: {fastest.value_counts()[fuzzer]}')
+        print(f'{fuzzer}: {fastest[fuzzer]}')
     print('')
 
     #
     # Missed
     #
 
-    # Find all the bugs that were triggered by at least one fuzzer
-    all_triggered_bugs = defaultdict(set)
-    for (program, bug), bug_df in df.groupby(['program', 'bug']):
-        if not bug_df.seconds.isna().all():
-            all_triggered_bugs[program].add(bug)
-
-    # Find the bugs triggered by each fuzzer
-    triggered = defaultdict(lambda: defaultdict(set))
-    for (program, bug, fuzzer), fuzz_df in df.groupby(['program', 'bug', 'fuzzer']):
-        # The bug is triggered if it is found in _any_ trial
-        if not fuzz_df.seconds.isna().all():
-            triggered[fuzzer][program].add(bug)
+    # A fuzzer misses a bug if at least one fuzzer triggered it but this
+    # fuzzer did not. Every row of the matrix is a triggered bug by
+    # construction, so that is just each fuzzer's count of False cells
+    missed = pd.Series((~trig_matrix).sum(axis=0), index=fuzzer_names)
 
     print('Missed:')
     for fuzzer in FUZZERS.values():
-        # Missed bugs is now the set difference
-        missed = []
-        for program, bugs in all_triggered_bugs.items():
-            missed.extend([bug for bug in (bugs - triggered[fuzzer][program])])
-        print(f'{fuzzer}: {len(missed)}')
+        print(f'{fuzzer}: {missed[fuzzer]}')
     print('')
 
     #
@@ -195,7 +211,7 @@ def main():
 
     print('Consistency')
     for fuzzer in FUZZERS.values():
-        consistency = totals.value_counts()[fuzzer] / unique[fuzzer] / NUM_TRIALS
+        consistency = totals[fuzzer] / unique[fuzzer] / NUM_TRIALS
         print(f'{fuzzer}: {consistency:.02f}')
     print('')
 
@@ -1,13 +1,22 @@
 #!/usr/bin/env python3
 
 from collections import defaultdict, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import os
 
 import numpy as np
 import pandas as pd
 
+from joblib import Memory
 from scipy.stats import bootstrap, mannwhitneyu
 
+# Numba is optional: without it the AUC computation falls back to pandas
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 
 # THIS_DIR = Path(__file__).parent
 # DATA_PATH = THIS_DIR.parent / 'data'
@@ -43,50 +52,114 @@ FUZZERS = OrderedDict(
     rl_fuzzing_sample='\\algosample',
 )
 
+# Cache the parsed per-fuzzer CSVs on disk so that re-runs (e.g. while
+# iterating on the table-printing code) skip the gzip ingest entirely
+MEMORY = Memory(THIS_DIR / '.cov_cache', verbose=0)
+
+
+@MEMORY.cache
+def _read_data(path, mtime_ns, size):
+    # The mtime/size arguments only key the cache: hashing the parsed
+    # DataFrame itself would cost about as much as re-reading it. Only the
+    # listed columns are used downstream, and the explicit dtypes skip the
+    # type-inference pass over the decompressed data
+    return pd.read_csv(
+        path,
+        usecols=['benchmark', 'fuzzer', 'trial_id', 'time', 'edges_covered'],
+        dtype={'benchmark': 'category', 'fuzzer': 'category',
+               'trial_id': 'int32', 'time': 'float64',
+               'edges_covered': 'int64'})
+
+
+def _load_data(path: Path) -> pd.DataFrame:
+    stat = path.stat()
+    return _read_data(str(path), stat.st_mtime_ns, stat.st_size)
+
+
 def combined_data():
-    data_df = []
-    for fuzzer_dir in FUZZER_DIRS:
-        fuzzer_data_path = DATA_PATH / fuzzer_dir / 'data.csv.gz'
-        df = pd.read_csv(fuzzer_data_path)
-        data_df.append(df)
+    data_paths = [DATA_PATH / fuzzer_dir / 'data.csv.gz'
+                  for fuzzer_dir in FUZZER_DIRS]
+    # The per-fuzzer gzipped CSVs decompress in parallel: read_csv releases
+    # the GIL for most of the work, so threads are enough
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        data_df = list(executor.map(_load_data, data_paths))
     data_df = pd.concat(data_df, axis=0)
+    # Categoricals factorize the string keys once, so the groupbys downstream
+    # hash small integer codes instead of re-hashing strings
+    for col in ('benchmark', 'fuzzer'):
+        data_df[col] = data_df[col].astype('category')
     return data_df
 
+if njit is not None:
+    @njit(cache=True)
+    def _auc_sums(group_ids, time, edges):
+        # One fused loop accumulating edges[i] / (time[i] - time[i-1]) per
+        # trial, with no temporary arrays. `group_ids` numbers the
+        # (benchmark, fuzzer, trial) groups consecutively over the sorted rows
+        n_groups = group_ids[-1] + 1 if group_ids.size else 0
+        out = np.zeros(n_groups)
+        for i in range(1, group_ids.shape[0]):
+            if group_ids[i] == group_ids[i - 1]:
+                out[group_ids[i]] += edges[i] / (time[i] - time[i - 1])
+        return out
+
+
 def compute_coverage_and_AUC(df):
-    
-    fuzzers = np.unique(df['fuzzer'].values)
-    benchmarks = np.unique(df['benchmark'].values)
-    
-    coverage = dict(target=[], fuzzer=[], coverage=[])
-    AUC = dict(target=[], fuzzer=[], AUC=[])
-    for benchmark in benchmarks:
-        if benchmark == 'libpcap_fuzz_both':
-            continue
-        for fuzzer in fuzzers:
-            fuzzers = np.unique(df['fuzzer'].values)
-            benchmarks = np.unique(df['benchmark'].values)
-            idx = (df['fuzzer'] == fuzzer) & (df['benchmark'] == benchmark)
-            fuzzer_df = df.loc[idx,:]
-            for trial_id in np.unique(fuzzer_df['trial_id']):
-                trial_idx = fuzzer_df['trial_id'] == trial_id
-                time = fuzzer_df.loc[trial_idx,'time'].values
-                
-                edge_coverage = fuzzer_df.loc[trial_idx,'edges_covered'].values
-                coverage['target'].append(benchmark)
-                coverage['fuzzer'].append(fuzzer)
-                coverage['coverage'].append(edge_coverage[np.argmax(time)])
-                
-                AUC['target'].append(benchmark)
-                AUC['fuzzer'].append(fuzzer)
-                AUC['AUC'].append(np.sum(edge_coverage[1:] / (time[1:] - time[:-1])))
+    # The libpcap results are not used in the paper
+    df = df[df['benchmark'] != 'libpcap_fuzz_both']
+
+    # One global sort replaces the per-benchmark/fuzzer/trial boolean masks:
+    # every per-trial statistic below becomes a single C-level groupby
+    df = df.sort_values(['benchmark', 'fuzzer', 'trial_id', 'time'])
+    grp = df.groupby(['benchmark', 'fuzzer', 'trial_id'], observed=True,
+                     sort=False)
+
+    # After the sort, the coverage at the end of a trial is simply the last
+    # sample in the trial
+    coverage = grp['edges_covered'].last().reset_index().rename(
+        columns=dict(benchmark='target', edges_covered='coverage')
+    )[['target', 'fuzzer', 'coverage']]
+
+    # AUC is sum(edges[1:] / (time[1:] - time[:-1]))
+    if njit is not None:
+        # ngroup numbers the groups in the same order that `coverage` lists
+        # them, so the kernel output lines up row for row
+        auc_values = _auc_sums(grp.ngroup().to_numpy(),
+                               df['time'].to_numpy(np.float64),
+                               df['edges_covered'].to_numpy(np.float64))
+        AUC = coverage[['target', 'fuzzer']].assign(AUC=auc_values)
+    else:
+        # The groupby diff computes the time deltas per trial (the first
+        # sample in each trial becomes NaN, which the sum skips)
+        df = df.assign(contrib=df['edges_covered'] / grp['time'].diff())
+        AUC = df.groupby(
+            ['benchmark', 'fuzzer', 'trial_id'], observed=True, sort=False
+        )['contrib'].sum().reset_index().rename(
+            columns=dict(benchmark='target', contrib='AUC')
+        )[['target', 'fuzzer', 'AUC']]
+
     return coverage, AUC
 
 
+def bootstrap_ci(xs):
+    # method='percentile' copes with degenerate (zero-variance) samples, so
+    # no random jitter needs to be added to the data first
+    try:
+        return bootstrap((np.asarray(xs), ), statistic=np.mean,
+                         vectorized=True, axis=-1, n_resamples=2000,
+                         method='percentile').standard_error
+    except ValueError:
+        return 0.0
+
+
 def print_table(df: pd.DataFrame, aggfunc) -> None:
-    df = df.pivot_table(index=['target'],
-                        columns=['fuzzer'],
-                        aggfunc=aggfunc)
-    df = df.reindex(FUZZERS.values(), axis=1, level=1).sort_index()
+    # Each (target, fuzzer) cell aggregates a unique group, so a plain
+    # groupby-agg-unstack does the job without pivot_table's generic
+    # duplicate-handling path
+    (value_col, ) = df.columns.difference(['target', 'fuzzer'])
+    df = df.groupby(['target', 'fuzzer'], observed=True,
+                    sort=False)[value_col].agg(aggfunc).unstack('fuzzer')
+    df = df.reindex(FUZZERS.values(), axis=1).sort_index()
     style = df.style
     style.format('{:.2f}', na_rep='')
     print(style.to_latex())
@@ -95,27 +168,36 @@ def sig_diff(df, coverage_or_AUC):
     fuzzers = np.unique(df['fuzzer'].values)
     benchmarks = np.unique(df['target'].values)
 
+    # Group the values once up front: every (benchmark, fuzzer) lookup in the
+    # double fuzzer loop below is then a dict hit on a contiguous NumPy array
+    # instead of a boolean scan over the whole frame
+    groups = {
+        key: values.to_numpy()
+        for key, values in df.groupby(['target', 'fuzzer'], observed=True,
+                                      sort=False)[coverage_or_AUC]
+    }
+    sum_zero = {key: not values.any() for key, values in groups.items()}
 
     best_value = dict(target=[], fuzzer=[], mean_value=[], no_sig_diff=[])
     for benchmark in benchmarks:
         if benchmark == 'libpcap_fuzz_both':
             continue
         for fuzzer_1 in fuzzers:
-            benchmark_idx = df['target'] == benchmark
-            fuzzer_1_idx =  df['fuzzer'] == fuzzer_1
-            values_1 = df.loc[benchmark_idx & fuzzer_1_idx, coverage_or_AUC]
-            mean_value = np.mean(values_1)
+            key_1 = (benchmark, fuzzer_1)
+            values_1 = groups.get(key_1)
+            mean_value = np.mean(values_1) if values_1 is not None else np.nan
 
             no_sig_diff = list()
-            for fuzzer_2 in fuzzers:
-                fuzzer_2_idx =  df['fuzzer'] == fuzzer_2
-                values_2 = df.loc[benchmark_idx & fuzzer_2_idx, coverage_or_AUC]
-                if ((np.sum(values_1) == 0) or (np.sum(values_2) == 0)):
-                    continue
+            if values_1 is not None and not sum_zero[key_1]:
+                for fuzzer_2 in fuzzers:
+                    key_2 = (benchmark, fuzzer_2)
+                    values_2 = groups.get(key_2)
+                    if values_2 is None or sum_zero[key_2]:
+                        continue
 
-                U1, p = mannwhitneyu(values_1, values_2)
-                if p > 0.05:
-                    no_sig_diff.append(fuzzer_2)
+                    U1, p = mannwhitneyu(values_1, values_2)
+                    if p > 0.05:
+                        no_sig_diff.append(fuzzer_2)
 
             best_value['target'].append(benchmark)
             best_value['fuzzer'].append(fuzzer_1)
@@ -143,7 +225,7 @@ def main():
     benchmarks = np.unique(df['benchmark'].values)
     
     print('=======START COVERAGE=======')
-    df = pd.DataFrame.from_dict(coverage)
+    df = coverage
     df['fuzzer'] = df.fuzzer.map(FUZZERS)
     df = df.dropna()
 
@@ -151,15 +233,14 @@ def main():
     print_table(df, np.mean)
 
     # Print CIs
-    ci = lambda xs: bootstrap((xs + (np.random.rand(len(xs)) * (1e-7)), ), statistic=np.mean).standard_error
-    print_table(df,ci)
+    print_table(df, bootstrap_ci)
     
     sig_diff_coverage = sig_diff(df, 'coverage')
     print_best_value(df, sig_diff_coverage)
     print('=======END COVERAGE=======')
     
     print('=======START AUC=======')
-    df = pd.DataFrame.from_dict(AUC)
+    df = AUC
     df['fuzzer'] = df.fuzzer.map(FUZZERS)
     df = df.dropna()
     
@@ -167,8 +248,7 @@ def main():
     print_table(df, np.mean)
 
     # Print CIs
-    ci = lambda xs: bootstrap((xs + (np.random.rand(len(xs)) * (1e-7)), ), statistic=np.mean).standard_error
-    print_table(df,ci)
+    print_table(df, bootstrap_ci)
     
 
     sig_diff_AUC = sig_diff(df, 'AUC')
@@ -52,6 +52,14 @@ TARGETS = [
 TRIAL_RE = re.compile(r'''-trial-(\d+)''')
 EXECS_PER_SEC_RE = re.compile(r'''execs_per_sec     : (\d+.\d+)''')
 
+# Match the target/fuzzer prefix of a filename in one compiled regex pass
+# instead of trying every name with `startswith`. Longest alternative first so
+# that the longest prefix wins
+TARGET_RE = re.compile('|'.join(
+    re.escape(t) for t in sorted(TARGETS, key=len, reverse=True)))
+FUZZER_RE = re.compile('|'.join(
+    re.escape(f) for f in sorted(FUZZERS, key=len, reverse=True)))
+
 
 def main(args):
     """The main function."""
@@ -64,45 +72,69 @@ def main(args):
     for stats_path in Path(args[1]).iterdir():
         stats_file = stats_path.name
 
-        try:
-            target = next(t for t in TARGETS if stats_file.startswith(t))
-            fuzzer = next(f for f in FUZZERS
-                          if stats_file[len(target) + 1:].startswith(f))
-            trial = int(TRIAL_RE.search(stats_file)[1])
-        except StopIteration:
+        target_match = TARGET_RE.match(stats_file)
+        # The fuzzer name starts right after the target and its separator
+        fuzzer_match = target_match and FUZZER_RE.match(stats_file,
+                                                        target_match.end() + 1)
+        trial_match = fuzzer_match and TRIAL_RE.search(stats_file)
+        if not trial_match:
             print(f'Skipping {stats_file}')
             continue
 
+        target = target_match[0]
+        fuzzer = fuzzer_match[0]
+        trial = int(trial_match[1])
+
+        # Only three fields matter, so scan the file once and stop as soon as
+        # all of them have been seen (rather than reading the whole file into
+        # a list and scanning it once per field)
+        fields = {}
+        empty = True
         with stats_path.open() as inf:
-            lines = [line for line in inf]
-            if not lines:
-                print(f'{stats_path} is empty. Skipping')
-                continue
-            start_time = next(line for line in lines
-                              if line.startswith('start_time ')).split(' : ')[1]
-            last_update = next(line for line in lines
-                               if line.startswith('last_update ')).split(' : ')[1]
-            runtime = int(last_update) - int(start_time)
-
-            # If the fuzz run was less than 20 hours, skip it
-            # (results are not indicative)
-            if runtime / 60 / 60 < 20:
-                print(f'{stats_file} runtime {runtime / 60 / 60:.02f} < 20 hours. Skipping')
-                continue
-            exec_line = next(line for line in lines
-                             if line.startswith('execs_per_sec '))
-            execs = float(exec_line.split(' : ')[1])
+            for line in inf:
+                empty = False
+                if line.startswith(('start_time ', 'last_update ',
+                                    'execs_per_sec ')):
+                    key, value = line.split(' : ', 1)
+                    fields[key.strip()] = value.strip()
+                    if len(fields) == 3:
+                        break
+
+        if empty:
+            print(f'{stats_path} is empty. Skipping')
+            continue
+
+        runtime = int(fields['last_update']) - int(fields['start_time'])
+
+        # If the fuzz run was less than 20 hours, skip it
+        # (results are not indicative)
+        if runtime / 60 / 60 < 20:
+            print(f'{stats_file} runtime {runtime / 60 / 60:.02f} < 20 hours. Skipping')
+            continue
+        execs = float(fields['execs_per_sec'])
 
         data['target'].append(target)
         data['fuzzer'].append(fuzzer)
         data['trial'].append(trial)
         data['execs'].append(execs)
 
-    df = pd.DataFrame.from_dict(data)
+    # Keep the last 10 trials per (target, fuzzer): one global sort plus a
+    # C-level tail replaces the per-group sort inside the loop
+    df = pd.DataFrame.from_dict(data).sort_values(
+        ['target', 'fuzzer', 'trial']
+    ).groupby(
+        ['target', 'fuzzer'],
+        observed=True,
+        sort=False
+    ).tail(10)
+
     fuzzer_execs = defaultdict(list)
 
-    for (target, fuzzer), execs_df in df.groupby(['target', 'fuzzer']):
-        execs = execs_df.sort_values('trial').tail(10).execs.mean()
+    # The rows are already sorted by (target, fuzzer), so sort=False keeps
+    # the printed order while skipping the groupby's own sort
+    mean_execs = df.groupby(['target', 'fuzzer'], observed=True,
+                            sort=False)['execs'].mean()
+    for (target, fuzzer), execs in mean_execs.items():
         fuzzer_execs[fuzzer].append(execs)
         print(f'{target},{fuzzer},{execs:.02f}')
     print('')
@@ -111,7 +143,8 @@ def main(args):
     for fuzzer in FUZZERS:
         execs = fuzzer_execs[fuzzer]
         summary = np.mean(execs)
-        ci = bootstrap((execs, ), np.mean)
+        ci = bootstrap((execs, ), np.mean, vectorized=True, axis=-1,
+                       n_resamples=2000)
         print(f'{fuzzer} & {summary:0.2f} & {ci.standard_error:0.2f}')
     print('')
 
@@ -119,7 +152,8 @@ def main(args):
     for fuzzer in FUZZERS:
         execs = fuzzer_execs[fuzzer]
         summary = np.median(execs)
-        ci = bootstrap((execs, ), np.median)
+        ci = bootstrap((execs, ), np.median, vectorized=True, axis=-1,
+                       n_resamples=2000)
         print(f'{fuzzer} & {summary:0.2f} & {ci.standard_error:0.2f}')
     print('')
 
@@ -127,7 +161,8 @@ def main(args):
     for fuzzer in FUZZERS:
         execs = fuzzer_execs[fuzzer]
         summary = gmean(execs)
-        ci = bootstrap((execs, ), gmean)
+        ci = bootstrap((execs, ), gmean, vectorized=True, axis=-1,
+                       n_resamples=2000)
         print(f'{fuzzer} & {summary:0.2f} & {ci.standard_error:0.2f}')
     print('')
 
@@ -2,7 +2,9 @@
 
 
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import os
 import re
 import sys
 
@@ -54,6 +56,14 @@ TARGETS = [
     'zlib_zlib_uncompress_fuzzer',
 ]
 
+# Match the target/fuzzer prefix of a filename in one compiled regex pass
+# instead of trying every name with `startswith`. Longest alternative first so
+# that the longest prefix wins
+TARGET_RE = re.compile('|'.join(
+    re.escape(t) for t in sorted(TARGETS, key=len, reverse=True)))
+FUZZER_RE = re.compile('|'.join(
+    re.escape(f) for f in sorted(FUZZERS, key=len, reverse=True)))
+
 
 def calc_overhead(df: pd.DataFrame) -> float:
     if df.empty:
@@ -68,24 +78,50 @@ def calc_queue_update_count(df: pd.DataFrame) -> int:
     return len(df)
 
 
-def calc_queue_update_time(df: pd.DataFrame) -> float:
-    if df.empty:
-        return np.nan
-    return (df.overhead - df.overhead.shift(fill_value=0)).mean() * 1000
-
-
-def calc_queue_update_variance(df: pd.DataFrame) -> float:
+def calc_queue_update_stats(df: pd.DataFrame) -> tuple:
+    # Mean (in ms) and variance of the per-update overhead deltas. The deltas
+    # are computed once in NumPy and shared by both statistics
     if df.empty:
-        return np.nan
-    return np.var((df.overhead - df.overhead.shift(fill_value=0)))
-
-
-def print_table(df: pd.DataFrame, aggfunc) -> None:
-    df = df.pivot_table(values=['overhead'],
-                        index=['target'],
-                        columns=['fuzzer'],
-                        aggfunc=aggfunc)
-    df = df.reindex(FUZZERS.values(), axis=1, level=1).sort_index()
+        return np.nan, np.nan
+    overhead = df.overhead.to_numpy()
+    diffs = np.empty_like(overhead)
+    diffs[0] = overhead[0]
+    np.subtract(overhead[1:], overhead[:-1], out=diffs[1:])
+    return diffs.mean() * 1000, diffs.var()
+
+
+def load_overhead(p: Path) -> tuple:
+    target_match = TARGET_RE.match(p.name)
+    # The fuzzer name starts right after the target and its separator
+    fuzzer_match = target_match and FUZZER_RE.match(p.name,
+                                                    target_match.end() + 1)
+    trial_match = fuzzer_match and TRIAL_RE.search(p.name)
+    if not trial_match:
+        print(f'Skipping {p}...')
+        return None
+
+    target = target_match[0]
+    fuzzer = fuzzer_match[0]
+    trial = int(trial_match[1])
+
+    try:
+        df = pd.read_csv(p, header=None, names=CSV_COLS, dtype=np.float64)
+    except Exception as e:
+        print(f'Failed to read {p}: {e}')
+        return None
+
+    update_time, update_variance = calc_queue_update_stats(df)
+
+    return (target, FUZZERS[fuzzer], trial, update_time, update_variance,
+            calc_queue_update_count(df), calc_overhead(df))
+
+
+def print_table(gb, aggfunc) -> None:
+    # `gb` is the (target, fuzzer) overhead groupby, built once in `main`:
+    # only the reducer changes between tables, so there is no need to redo
+    # the grouping (or pay for `pivot_table`'s generic path) per table
+    df = gb.agg(aggfunc).unstack('fuzzer')
+    df = df.reindex(columns=list(FUZZERS.values())).sort_index()
     style = df.style
     style.format('{:.2f}', na_rep='\\xmark')
     print(style.to_latex())
@@ -107,51 +143,65 @@ def main(args):
         overhead=[]
     )
 
-    for p in Path(args[1]).glob('*.csv.gz'):
-        try:
-            target = next(t for t in TARGETS if p.name.startswith(t))
-            fuzzer = next(f for f in FUZZERS
-                          if p.name[len(target) + 1:].startswith(f))
-            trial = int(TRIAL_RE.search(p.name)[1])
-        except StopIteration:
-            print(f'Skipping {p}...')
-            continue
+    # Reading the gzipped CSVs is I/O- and zlib-bound work that releases the
+    # GIL, so the per-trial loads parallelize well across threads
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        rows = executor.map(load_overhead, Path(args[1]).glob('*.csv.gz'))
 
-        try:
-            df = pd.read_csv(p, header=None)
-        except Exception as e:
-            print(f'Failed to read {p}: {e}')
+    for row in rows:
+        if row is None:
             continue
-        df.columns = CSV_COLS
+
+        (target, fuzzer, trial, update_time, update_variance, update_count,
+         overhead) = row
 
         data['target'].append(target)
-        data['fuzzer'].append(FUZZERS[fuzzer])
+        data['fuzzer'].append(fuzzer)
         data['trial'].append(trial)
-        data['update_time'].append(calc_queue_update_time(df))
-        data['update_variance'].append(calc_queue_update_variance(df))
-        data['update_count'].append(calc_queue_update_count(df))
-        data['overhead'].append(calc_overhead(df))
-
+        data['update_time'].append(update_time)
+        data['update_variance'].append(update_variance)
+        data['update_count'].append(update_count)
+        data['overhead'].append(overhead)
+
+    # Keep the last 10 trials per (target, fuzzer). One global sort plus a
+    # C-level tail replaces the per-group Python lambda (and its redundant
+    # per-group sort)
     df = pd.DataFrame.from_dict(
         data
+    ).sort_values(
+        ['target', 'fuzzer', 'trial']
     ).groupby(
         ['target', 'fuzzer'],
-        as_index=False
-    ).apply(
-        lambda x: x.sort_values('trial').tail(10)
-    ).reset_index(drop=True)
+        observed=True,
+        sort=False
+    ).tail(10).reset_index(drop=True)
+
+    # Grouping order does not matter here: print_table reindexes the columns
+    # and sorts the index itself
+    gb = df.groupby(['target', 'fuzzer'], observed=True,
+                    sort=False)['overhead']
 
     print('\nOverhead gmean')
-    print_table(df, gmean)
+    print_table(gb, gmean)
 
     def mean_ci(xs):
-        return bootstrap((xs, ), statistic=np.mean).standard_error
+        try:
+            return bootstrap((np.asarray(xs), ), statistic=np.mean,
+                             vectorized=True, axis=-1, n_resamples=2000,
+                             method='percentile').standard_error
+        except ValueError:
+            return 0.0
 
     def gmean_ci(xs):
-        return bootstrap((xs, ), statistic=gmean).standard_error
+        try:
+            return bootstrap((np.asarray(xs), ), statistic=gmean,
+                             vectorized=True, axis=-1, n_resamples=2000,
+                             method='percentile').standard_error
+        except ValueError:
+            return 0.0
 
     print('\nOverhead CI')
-    print_table(df, gmean_ci)
+    print_table(gb, gmean_ci)
 
     print('\nQueue update time (mean)')
     for fuzzer in FUZZERS.values():